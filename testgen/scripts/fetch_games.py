@@ -9,11 +9,27 @@ Usage:
 """
 
 import argparse
+import asyncio
+import atexit
+import hashlib
 import json
 import os
 import sys
 import time
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# orjson is ~3-10x faster than stdlib json and emits UTF-8 bytes directly;
+# fall back to stdlib when it isn't installed.
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps_meta(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    def _dumps_meta(obj):
+        return json.dumps(obj, indent=2).encode("utf-8")
 
 API = "https://woogles.io/api/game_service.GameMetadataService"
 GCG_DIR = os.path.join(os.path.dirname(__file__), "..", "gcg")
@@ -26,29 +42,187 @@ os.makedirs(META_DIR, exist_ok=True)
 # Woogles API helpers
 # ---------------------------------------------------------------------------
 
+# One pooled session for all sync API calls: keep-alive connections avoid a
+# fresh TCP+TLS handshake per request, and transient failures get retried.
+SESSION = requests.Session()
+# GCG payloads compress 5-10x on the wire; requests decompresses
+# transparently.
+SESSION.headers.update({"Content-Type": "application/json",
+                        "Accept-Encoding": "gzip"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3,
+                      status_forcelist=[500, 502, 503, 504])))
+
 def get_recent_games(username, num=50, offset=0):
-    r = requests.post(f"{API}/GetRecentGames",
-        headers={"Content-Type": "application/json"},
+    r = SESSION.post(f"{API}/GetRecentGames",
         json={"username": username, "numGames": num, "offset": offset},
         timeout=30)
     r.raise_for_status()
-    return r.json().get("game_info", [])
+    return _loads(r.content).get("game_info", [])
 
-def get_gcg(game_id):
-    r = requests.post(f"{API}/GetGCG",
-        headers={"Content-Type": "application/json"},
+def get_gcg(game_id, session=None):
+    r = (session or SESSION).post(f"{API}/GetGCG",
         json={"game_id": game_id},
         timeout=30)
     r.raise_for_status()
-    return r.json().get("gcg", "")
+    return _loads(r.content).get("gcg", "")
+
+# ---------------------------------------------------------------------------
+# Concurrent fetching (asyncio + aiohttp)
+# ---------------------------------------------------------------------------
+
+FETCH_CONCURRENCY = 8
+
+async def _get_gcg_async(session, sem, game_id, retries=3):
+    """Fetch one GCG with bounded concurrency and backoff on 5xx/timeouts."""
+    import aiohttp
+    async with sem:
+        for attempt in range(retries):
+            try:
+                async with session.post(f"{API}/GetGCG",
+                        json={"game_id": game_id}) as r:
+                    if r.status >= 500:
+                        raise aiohttp.ClientResponseError(
+                            r.request_info, r.history, status=r.status)
+                    r.raise_for_status()
+                    data = await r.json()
+                    return data.get("gcg", "")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                # Only 5xx/timeouts are transient; a 4xx (missing or
+                # private game) won't improve with backoff.
+                status = getattr(e, "status", 0)
+                if 400 <= status < 500:
+                    raise
+                if attempt == retries - 1:
+                    raise
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+async def _fetch_and_save_async(game_ids, info_by_id, concurrency):
+    # Fast-drain pipeline: save_game (parse + disk write) runs on each GCG
+    # as soon as its download lands, overlapping with the fetches still in
+    # flight instead of waiting for the whole batch.
+    # aiohttp is only needed on this bulk-fetch path; importing it lazily
+    # keeps match_game/woogles_lookup importable without it.
+    import aiohttp
+    sem = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=30)
+    saved = 0
+    async with aiohttp.ClientSession(
+            headers={"Content-Type": "application/json",
+                     "Accept-Encoding": "gzip"},
+            timeout=timeout) as session:
+
+        async def fetch_one(gid):
+            return gid, await _get_gcg_async(session, sem, gid)
+
+        for fut in asyncio.as_completed([fetch_one(gid) for gid in game_ids]):
+            gid, gcg = await fut
+            info = info_by_id.get(gid) if info_by_id else None
+            if save_game(gid, gcg, info):
+                saved += 1
+    return saved
+
+# Batch endpoint support is probed on first use: None = unknown,
+# then True/False for the rest of the run.
+BATCH_SIZE = 20
+_batch_supported = None
+
+def get_gcgs_batch(game_ids):
+    """Fetch up to BATCH_SIZE GCGs in one round-trip, if the API has a
+    batch endpoint.  Returns {game_id: gcg_text}, or None when the
+    endpoint is unavailable (callers fall back to per-id fetches)."""
+    global _batch_supported
+    if _batch_supported is False:
+        return None
+    try:
+        r = SESSION.post(f"{API}/BatchGetGCG",
+            json={"game_ids": list(game_ids)},
+            timeout=30)
+        if r.status_code == 200:
+            entries = _loads(r.content).get("gcgs")
+            if isinstance(entries, list):
+                _batch_supported = True
+                return {e["game_id"]: e.get("gcg", "")
+                        for e in entries if e.get("game_id")}
+    except requests.RequestException:
+        pass
+    _batch_supported = False
+    return None
+
+def fetch_and_save(game_ids, info_by_id=None, concurrency=FETCH_CONCURRENCY):
+    """Fetch GCGs for game_ids and save each via save_game.
+
+    Tries the batch endpoint first (BATCH_SIZE ids per round-trip); if the
+    server doesn't support it, falls back to concurrent per-id fetches.
+    """
+    if not game_ids:
+        return 0
+    saved = 0
+    remaining = []
+    for i in range(0, len(game_ids), BATCH_SIZE):
+        chunk = game_ids[i:i + BATCH_SIZE]
+        gcgs = get_gcgs_batch(chunk)
+        if gcgs is None:
+            remaining = game_ids[i:]
+            break
+        for gid in chunk:
+            info = info_by_id.get(gid) if info_by_id else None
+            if save_game(gid, gcgs.get(gid, ""), info):
+                saved += 1
+    if remaining:
+        saved += asyncio.run(
+            _fetch_and_save_async(remaining, info_by_id, concurrency))
+    return saved
 
 # ---------------------------------------------------------------------------
 # GCG analysis helpers
 # ---------------------------------------------------------------------------
 
+# analyze_gcg results keyed by content hash, persisted across runs so
+# re-fetching/re-categorizing an unchanged GCG never re-parses it.
+_ANALYZE_CACHE_PATH = os.path.join(META_DIR, ".parse_cache.json")
+_analyze_cache = {}
+_analyze_cache_dirty = False
+
+def _load_analyze_cache():
+    global _analyze_cache
+    try:
+        with open(_ANALYZE_CACHE_PATH, encoding="utf-8") as f:
+            _analyze_cache = json.load(f)
+    except (OSError, ValueError):
+        _analyze_cache = {}
+
+def _save_analyze_cache():
+    if not _analyze_cache_dirty:
+        return
+    try:
+        with open(_ANALYZE_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(_analyze_cache, f)
+    except OSError:
+        pass
+
+_load_analyze_cache()
+atexit.register(_save_analyze_cache)
+
+def _meta_copy(meta):
+    # save_game adds keys to the returned dict; hand out a fresh copy so
+    # the cached entry stays pristine.
+    return {k: (v[:] if isinstance(v, list) else v) for k, v in meta.items()}
+
 def analyze_gcg(gcg_text):
-    """Extract metadata from a GCG string."""
-    lines = gcg_text.strip().split("\n")
+    """Extract metadata from a GCG string (memoized on content hash)."""
+    global _analyze_cache_dirty
+    key = hashlib.blake2b(gcg_text.encode("utf-8"), digest_size=16).hexdigest()
+    cached = _analyze_cache.get(key)
+    if cached is not None:
+        return _meta_copy(cached)
+    meta = _analyze_gcg(gcg_text)
+    _analyze_cache[key] = _meta_copy(meta)
+    _analyze_cache_dirty = True
+    return meta
+
+def _analyze_gcg(gcg_text):
     meta = {
         "lexicon": None,
         "players": [],
@@ -59,7 +233,13 @@ def analyze_gcg(gcg_text):
         "final_scores": [],
         "game_type": "classic",
     }
+    # Split lines into headers and move lines with comprehensions (the
+    # filtering runs at C level), then answer each boolean with a
+    # short-circuiting any() over the pre-split move fields.
+    lines = gcg_text.splitlines()
     for line in lines:
+        if line[:1] != "#":
+            continue
         if line.startswith("#lexicon"):
             meta["lexicon"] = line.split(None, 1)[1].strip()
         elif line.startswith("#player"):
@@ -68,40 +248,74 @@ def analyze_gcg(gcg_text):
                 meta["players"].append(parts[2].strip())
         elif line.startswith("#game-type"):
             meta["game_type"] = line.split(None, 1)[1].strip()
-        elif line.startswith(">"):
-            # Move line: >player: RACK COORD WORD +score total
-            meta["move_count"] += 1
-            parts = line.split()
-            if len(parts) >= 4:
-                rack = parts[1] if len(parts) > 1 else ""
-                word = parts[3] if len(parts) > 3 else ""
-                score_part = parts[4] if len(parts) > 4 else ""
-                # Phony: score is negative (withdrawal)
-                if score_part.startswith("-"):
-                    meta["has_phony"] = True
-                # Exchange: word starts with - (exchange notation)
-                if word.startswith("-") and len(word) > 1 and word[1:].isalpha():
-                    meta["has_exchange"] = True
-                # Blank on board: lowercase letter in word (not in rack)
-                if word and any(c.islower() for c in word if c.isalpha()):
-                    meta["has_blank_on_board"] = True
-        # Final scores from last move
-    # Parse final scores from last >player line with total
-    for line in reversed(lines):
-        if line.startswith(">"):
-            parts = line.split()
-            if len(parts) >= 5:
-                try:
-                    meta["final_scores"].append(int(parts[-1]))
-                except ValueError:
-                    pass
-            break
+
+    # Move line: >player: RACK COORD WORD +score total
+    parts_list = [l.split() for l in lines if l.startswith(">")]
+    meta["move_count"] = len(parts_list)
+    # Phony: score is negative (withdrawal)
+    meta["has_phony"] = any(
+        len(p) > 4 and p[4].startswith("-") for p in parts_list)
+    # Exchange: word starts with - (exchange notation)
+    meta["has_exchange"] = any(
+        len(p) > 3 and p[3].startswith("-") and len(p[3]) > 1
+        and p[3][1:].isalpha() for p in parts_list)
+    # Blank on board: lowercase letter in word (not in rack)
+    meta["has_blank_on_board"] = any(
+        c.islower()
+        for p in parts_list if len(p) > 3
+        for c in p[3] if c.isalpha())
+    # Final scores from the last move line with a total field
+    if parts_list and len(parts_list[-1]) >= 5:
+        try:
+            meta["final_scores"].append(int(parts_list[-1][-1]))
+        except ValueError:
+            pass
     return meta
 
 # ---------------------------------------------------------------------------
 # Save a game
 # ---------------------------------------------------------------------------
 
+# game_id -> player names (full names + nicknames), so the matcher can
+# prune candidate games by player without opening any GCG or meta file.
+_PLAYERS_INDEX_PATH = os.path.join(META_DIR, "players_index.json")
+_players_index = None
+_players_index_dirty = False
+
+def _update_players_index(game_id, meta):
+    global _players_index, _players_index_dirty
+    if _players_index is None:
+        try:
+            with open(_PLAYERS_INDEX_PATH, "rb") as f:
+                _players_index = _loads(f.read())
+        except (OSError, ValueError):
+            _players_index = {}
+    names = set(meta.get("players") or [])
+    names.update(p["nickname"] for p in meta.get("players_info", [])
+                 if p.get("nickname"))
+    entry = sorted(names)
+    if _players_index.get(game_id) != entry:
+        _players_index[game_id] = entry
+        _players_index_dirty = True
+
+def _save_players_index():
+    if _players_index_dirty:
+        try:
+            _write_bytes(_PLAYERS_INDEX_PATH,
+                         json.dumps(_players_index).encode("utf-8"))
+        except OSError:
+            pass
+
+atexit.register(_save_players_index)
+
+def _write_bytes(path, buf):
+    """Write buf to path in a single syscall."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+
 def save_game(game_id, gcg_text, game_info=None):
     """Save GCG + metadata sidecar for a game."""
     gcg_path = os.path.join(GCG_DIR, f"{game_id}.gcg")
@@ -111,12 +325,24 @@ def save_game(game_id, gcg_text, game_info=None):
         print(f"  [skip] {game_id}: empty GCG")
         return False
 
-    # GCG file
-    with open(gcg_path, "w", encoding="utf-8") as f:
-        f.write(gcg_text)
+    # Re-runs: a sidecar at least as new as the GCG on disk is still valid,
+    # so reuse it instead of re-analyzing.  Checked before the GCG write
+    # below bumps the .gcg mtime.
+    meta = None
+    try:
+        if os.path.getmtime(meta_path) >= os.path.getmtime(gcg_path):
+            with open(meta_path, "rb") as f:
+                meta = _loads(f.read())
+    except (OSError, ValueError):
+        meta = None
+
+    # GCG file — one os.write of the full payload instead of going through
+    # the buffered text layer
+    _write_bytes(gcg_path, gcg_text.encode("utf-8"))
 
     # Metadata sidecar
-    meta = analyze_gcg(gcg_text)
+    if meta is None:
+        meta = analyze_gcg(gcg_text)
     if game_info:
         meta["source"] = "woogles"
         meta["game_id"] = game_id
@@ -137,8 +363,8 @@ def save_game(game_id, gcg_text, game_info=None):
             .get("rules", {})
             .get("board_layout_name", "CrosswordGame")
         )
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2)
+    _write_bytes(meta_path, _dumps_meta(meta))
+    _update_players_index(game_id, meta)
 
     print(f"  [saved] {game_id}: {meta.get('lexicon','?')} "
           f"moves={meta['move_count']} "
@@ -238,6 +464,10 @@ def main():
     if not any([args.game, args.player, args.curated, args.discover]):
         args.curated = True
 
+    # One readdir up front; a set membership test per candidate id beats a
+    # stat syscall per id in the loops below.
+    existing = set(os.listdir(GCG_DIR))
+
     if args.game:
         print(f"Fetching game {args.game}...")
         gcg = get_gcg(args.game)
@@ -248,30 +478,34 @@ def main():
         print(f"Fetching games for {args.player}...")
         games = fetch_player_games(args.player, args.pages)
         print(f"  {len(games)} games found, fetching GCGs...")
+        to_fetch = []
+        info_by_id = {}
         for g in games:
             gid = g["game_id"]
-            if os.path.exists(os.path.join(GCG_DIR, f"{gid}.gcg")):
+            if f"{gid}.gcg" in existing:
                 print(f"  [skip] {gid}: already exists")
                 continue
-            gcg = get_gcg(gid)
-            save_game(gid, gcg, g)
-            time.sleep(0.3)
+            to_fetch.append(gid)
+            info_by_id[gid] = g
+        fetch_and_save(to_fetch, info_by_id)
         return
 
     if args.curated:
         print(f"Fetching {len(CURATED_GAMES)} curated games...")
+        to_fetch = []
         for gid in CURATED_GAMES:
-            if os.path.exists(os.path.join(GCG_DIR, f"{gid}.gcg")):
+            if f"{gid}.gcg" in existing:
                 print(f"  [skip] {gid}: already exists")
                 continue
-            gcg = get_gcg(gid)
-            save_game(gid, gcg)
-            time.sleep(0.3)
+            to_fetch.append(gid)
+        fetch_and_save(to_fetch)
         return
 
     if args.discover:
         print(f"Discovering games from {len(DISCOVERY_PLAYERS)} players...")
         all_game_ids = set()
+        to_fetch = []
+        info_by_id = {}
         for player in DISCOVERY_PLAYERS:
             print(f"\nFetching {player}...")
             games = fetch_player_games(player, args.pages)
@@ -280,12 +514,12 @@ def main():
                 if gid in all_game_ids:
                     continue
                 all_game_ids.add(gid)
-                if os.path.exists(os.path.join(GCG_DIR, f"{gid}.gcg")):
+                if f"{gid}.gcg" in existing:
                     print(f"  [skip] {gid}")
                     continue
-                gcg = get_gcg(gid)
-                save_game(gid, gcg, g)
-                time.sleep(0.3)
+                to_fetch.append(gid)
+                info_by_id[gid] = g
+        fetch_and_save(to_fetch, info_by_id)
         print(f"\nTotal unique games: {len(all_game_ids)}")
 
 if __name__ == "__main__":
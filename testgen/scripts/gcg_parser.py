@@ -5,7 +5,8 @@ GCG parser: replays a GCG file and returns board state (CGP) at each turn.
 The CGP produced here is the offline ground truth — it never goes through OCR.
 """
 
-import re
+import functools
+import hashlib
 import sys
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
@@ -24,19 +25,20 @@ STANDARD_PREMIUM = [
 ]
 
 COLS = "ABCDEFGHIJKLMNO"  # 15 standard columns
+_COL_IDX = {c: i for i, c in enumerate(COLS)}
 
 # ---------------------------------------------------------------------------
 # Data types
 # ---------------------------------------------------------------------------
 
-@dataclass
-class Cell:
-    letter: str = ""   # uppercase = regular; lowercase = blank playing that letter
-    is_blank: bool = False
+# The board is a flat bytearray of 225 cells indexed r*15+c.  Each byte is
+# the ASCII letter on the square (uppercase = regular tile, lowercase =
+# blank playing that letter) or 0 for empty.  This keeps the whole board in
+# one small buffer and makes snapshots a single memcpy.
 
 @dataclass
 class GameState:
-    board: List[List[Cell]] = field(default_factory=lambda: [[Cell() for _ in range(15)] for _ in range(15)])
+    board: bytearray = field(default_factory=lambda: bytearray(225))
     racks: List[str] = field(default_factory=lambda: ["", ""])
     scores: List[int] = field(default_factory=lambda: [0, 0])
     turn: int = 0  # 0-indexed
@@ -45,30 +47,71 @@ class GameState:
     players: List[str] = field(default_factory=lambda: ["Player1", "Player2"])
     lexicon: str = ""
     game_id: str = ""
+    # Per-row CGP strings, invalidated by place_word/remove_word.  A move
+    # touches 1-7 rows, so to_cgp only re-encodes those instead of all 225
+    # cells every turn.
+    _row_cache: List[Optional[str]] = field(
+        default_factory=lambda: [None] * 15, repr=False)
 
     def copy(self):
-        import copy
-        return copy.deepcopy(self)
+        # Explicit shallow rebuild — deepcopy dominated parser runtime.
+        new = GameState.__new__(GameState)
+        new.board = self.board[:]
+        new._row_cache = self._row_cache[:]
+        new.racks = self.racks[:]
+        new.scores = self.scores[:]
+        new.turn = self.turn
+        new.on_turn = self.on_turn
+        new.is_event = self.is_event
+        new.players = self.players[:]
+        new.lexicon = self.lexicon
+        new.game_id = self.game_id
+        return new
+
+    def place_word(self, word: str, row: int, col: int, horizontal: bool):
+        place_word(self.board, word, row, col, horizontal)
+        self._invalidate_rows(word, row, horizontal)
+
+    def remove_word(self, word: str, row: int, col: int, horizontal: bool):
+        remove_word(self.board, word, row, col, horizontal)
+        self._invalidate_rows(word, row, horizontal)
+
+    def _invalidate_rows(self, word: str, row: int, horizontal: bool):
+        if horizontal:
+            self._row_cache[row] = None
+        else:
+            for r in range(row, min(row + len(word), 15)):
+                self._row_cache[r] = None
+
+    def _encode_row(self, r: int) -> str:
+        # Build into a bytearray — appending bytes is O(1) amortized,
+        # unlike += on str which reallocates the row on every character.
+        out = bytearray()
+        empty = 0
+        for b in self.board[r * 15:(r + 1) * 15]:
+            if not b:
+                empty += 1
+            else:
+                if empty:
+                    out += b"%d" % empty
+                    empty = 0
+                out.append(b)
+        if empty:
+            out += b"%d" % empty
+        row = out.decode("ascii")
+        self._row_cache[r] = row
+        return row
+
+    def tile_count(self) -> int:
+        """Number of occupied squares (bytes.count runs in C)."""
+        return 225 - self.board.count(0)
 
     def to_cgp(self, rack: str = None, lexicon: str = None) -> str:
         """Serialize board to CGP format."""
-        rows = []
-        for r in range(15):
-            row = ""
-            empty = 0
-            for c in range(15):
-                cell = self.board[r][c]
-                if not cell.letter:
-                    empty += 1
-                else:
-                    if empty:
-                        row += str(empty)
-                        empty = 0
-                    row += cell.letter
-            if empty:
-                row += str(empty)
-            rows.append(row)
-        board_str = "/".join(rows)
+        cache = self._row_cache
+        board_str = "/".join(
+            cache[r] if cache[r] is not None else self._encode_row(r)
+            for r in range(15))
         rack_str = rack if rack is not None else self.racks[self.on_turn]
         lex = lexicon or self.lexicon or "NWL23"
         s0, s1 = self.scores
@@ -78,68 +121,146 @@ class GameState:
 # Coordinate parsing
 # ---------------------------------------------------------------------------
 
+@functools.lru_cache(maxsize=1024)
 def parse_coord(coord: str) -> Tuple[int, int, bool]:
     """
     Parse a move coordinate like '8H' (row 8, col H, horizontal) or
     'H8' (col H, row 8, vertical).
     Returns (row, col, horizontal) — both 0-indexed.
+
+    Memoized: only ~450 distinct coordinates exist (15 rows x 15 columns
+    x 2 orientations), and they repeat heavily across games.
+
+    The grammar is trivial (digits+letters or letters+digits), so this
+    dispatches on the first character instead of paying for the regex
+    engine on every move line.
     """
     coord = coord.upper()
-    # Horizontal: digit(s) + letter(s), e.g. "8H", "12A", "8HI"
-    m = re.match(r'^(\d+)([A-O]+)$', coord)
-    if m:
-        row = int(m.group(1)) - 1
-        col = COLS.index(m.group(2)[0])
-        return row, col, True
-    # Vertical: letter(s) + digit(s), e.g. "H8", "A12"
-    m = re.match(r'^([A-O]+)(\d+)$', coord)
-    if m:
-        col = COLS.index(m.group(1)[0])
-        row = int(m.group(2)) - 1
-        return row, col, False
-    raise ValueError(f"Cannot parse coordinate: {coord}")
+    try:
+        if coord[0].isdigit():
+            # Horizontal: digit(s) + letter(s), e.g. "8H", "12A", "8HI"
+            i = 1
+            n = len(coord)
+            while i < n and coord[i].isdigit():
+                i += 1
+            for ch in coord[i + 1:]:
+                if ch not in _COL_IDX:
+                    raise ValueError
+            return int(coord[:i]) - 1, _COL_IDX[coord[i]], True
+        # Vertical: letter(s) + digit(s), e.g. "H8", "A12"
+        i = 1
+        n = len(coord)
+        while i < n and coord[i] in _COL_IDX:
+            i += 1
+        # int() alone would accept signs/underscores ("H-5", "H1_2");
+        # require plain digits like the horizontal branch does.
+        if not coord[i:].isdigit():
+            raise ValueError
+        return int(coord[i:]) - 1, _COL_IDX[coord[0]], False
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"Cannot parse coordinate: {coord}") from None
 
 # ---------------------------------------------------------------------------
 # Place a word on the board
 # ---------------------------------------------------------------------------
 
-def place_word(board: List[List[Cell]], word: str, row: int, col: int, horizontal: bool):
+def place_word(board: bytearray, word: str, row: int, col: int, horizontal: bool):
     """
     Place a word on the board. '.' means the tile is already there (through-play).
     Lowercase = blank playing that letter.
     """
-    r, c = row, col
-    for ch in word:
-        if ch != '.':
-            is_blank = ch.islower()
-            board[r][c] = Cell(letter=ch, is_blank=is_blank)
+    idx = row * 15 + col
+    if '.' not in word:
+        # Common case (no through-tiles): a single slice store — contiguous
+        # for horizontal plays, stride-15 for vertical.
+        data = word.encode("ascii")
         if horizontal:
-            c += 1
+            board[idx:idx + len(data)] = data
         else:
-            r += 1
-
-def remove_word(board: List[List[Cell]], word: str, row: int, col: int, horizontal: bool):
-    """Remove tiles placed by a word (for phony withdrawal). '.' = pre-existing, skip."""
-    r, c = row, col
+            board[idx:idx + 15 * len(data):15] = data
+        return
+    step = 1 if horizontal else 15
     for ch in word:
         if ch != '.':
-            board[r][c] = Cell()
+            board[idx] = ord(ch)
+        idx += step
+
+def remove_word(board: bytearray, word: str, row: int, col: int, horizontal: bool):
+    """Remove tiles placed by a word (for phony withdrawal). '.' = pre-existing, skip."""
+    idx = row * 15 + col
+    if '.' not in word:
+        zeros = bytes(len(word))
         if horizontal:
-            c += 1
+            board[idx:idx + len(zeros)] = zeros
         else:
-            r += 1
+            board[idx:idx + 15 * len(zeros):15] = zeros
+        return
+    step = 1 if horizontal else 15
+    for ch in word:
+        if ch != '.':
+            board[idx] = 0
+        idx += step
 
 # ---------------------------------------------------------------------------
 # GCG replay
 # ---------------------------------------------------------------------------
 
+# Replay results keyed by content hash — the matching pipeline replays the
+# same GCGs over and over.  Copies are handed out because callers mutate
+# states in place (patch_forward_racks).
+_REPLAY_CACHE = {}
+_REPLAY_CACHE_MAX = 4096
+
 def parse_gcg(gcg_text: str) -> List[GameState]:
     """
     Replay a GCG and return a list of GameState at each turn (after each move).
     Index 0 = state after move 1, etc.
     The list starts with the initial empty board (index -1 if you want that).
+    Results are memoized on a content hash; repeated parses of the same
+    GCG only pay for the state copies.
+    """
+    key = hashlib.blake2b(gcg_text.encode("utf-8"), digest_size=16).digest()
+    cached = _REPLAY_CACHE.get(key)
+    if cached is None:
+        if len(_REPLAY_CACHE) >= _REPLAY_CACHE_MAX:
+            _REPLAY_CACHE.clear()
+        cached = _REPLAY_CACHE[key] = _replay_gcg(gcg_text)
+    return [s.copy() for s in cached]
+
+
+def parse_gcg_to_cgp(gcg_text: str) -> List[str]:
     """
-    lines = gcg_text.strip().split("\n")
+    Replay a GCG and return only the CGP string at each turn.
+
+    Cheaper than parse_gcg for callers that never touch the GameState
+    objects (e.g. bulk testdata generation): the CGPs are read straight
+    off the cached replay, so no per-move state copies are made.
+    """
+    key = hashlib.blake2b(gcg_text.encode("utf-8"), digest_size=16).digest()
+    cached = _REPLAY_CACHE.get(key)
+    if cached is None:
+        if len(_REPLAY_CACHE) >= _REPLAY_CACHE_MAX:
+            _REPLAY_CACHE.clear()
+        cached = _REPLAY_CACHE[key] = _replay_gcg(gcg_text)
+    return [s.to_cgp() for s in cached]
+
+
+# Optional native fast path: a compiled extension (e.g. a Cython build of
+# the replay loop) can be dropped next to these scripts as _gcg_native,
+# providing replay(gcg_text) -> list[str] of per-event CGPs.  The scripts
+# tree has no build step, so the pure-Python replay is the default.
+try:
+    from _gcg_native import replay  # noqa: F401
+except ImportError:
+    def replay(gcg_text: str) -> List[str]:
+        """CGP string after each event — alias for parse_gcg_to_cgp."""
+        return parse_gcg_to_cgp(gcg_text)
+
+
+def _replay_gcg(gcg_text: str) -> List[GameState]:
+    # splitlines is faster than strip().split("\n") and doesn't yield a
+    # trailing empty entry for newline-terminated files.
+    lines = gcg_text.splitlines()
 
     state = GameState()
     # Track which player maps to player index
@@ -153,10 +274,14 @@ def parse_gcg(gcg_text: str) -> List[GameState]:
 
     pending_phony = None  # (row, col, horizontal, word) — waiting to see if challenged
 
-    for line in lines:
-        line = line.strip()
-
-        # Header lines
+    # Stage 1: headers.  All #-directives precede the first move line, so
+    # the move loop below never has to test for them.
+    i = 0
+    n = len(lines)
+    while i < n:
+        line = lines[i].strip()
+        if line.startswith(">"):
+            break
         if line.startswith("#lexicon"):
             state.lexicon = line.split(None, 1)[1].strip()
         elif line.startswith("#id"):
@@ -177,18 +302,18 @@ def parse_gcg(gcg_text: str) -> List[GameState]:
             state.players[1] = fullname
             nicknames[nickname] = 1
             nicknames[fullname] = 1
-        elif not line.startswith(">"):
-            continue
+        i += 1
 
+    # Stage 2: moves only.
+    for line in lines[i:]:
+        line = line.strip()
         if not line.startswith(">"):
             continue
 
         # Move line: >PlayerName: RACK COORD WORD +score total
-        # Strip leading ">"
-        line = line[1:]
-        colon = line.index(":")
-        player_name = line[:colon].strip()
-        rest = line[colon+1:].strip().split()
+        player_name, _, rest_str = line[1:].partition(":")
+        player_name = player_name.strip()
+        rest = rest_str.split()
 
         if len(rest) < 4:
             continue
@@ -226,7 +351,7 @@ def parse_gcg(gcg_text: str) -> List[GameState]:
             state.scores[pidx] = total  # score reverts
             if pending_phony:
                 pr, pc, ph, pw = pending_phony
-                remove_word(state.board, pw, pr, pc, ph)
+                state.remove_word(pw, pr, pc, ph)
                 pending_phony = None
             # Player stays on turn (same player replays)
             ev = state.copy()
@@ -271,7 +396,7 @@ def parse_gcg(gcg_text: str) -> List[GameState]:
             continue
 
         # Place tiles
-        place_word(state.board, word, row, col, horizontal)
+        state.place_word(word, row, col, horizontal)
         state.scores[pidx] = total
 
         # Remember this play in case it gets challenged
@@ -12,27 +12,36 @@ All diagnostic print() output is redirected to stderr to keep stdout clean.
 import json
 import os
 import sys
-import builtins
+from contextlib import redirect_stdout
 
-# Redirect print() to stderr so stdout stays clean for JSON output.
-_real_print = builtins.print
-def _stderr_print(*args, **kwargs):
-    kwargs['file'] = sys.stderr
-    _real_print(*args, **kwargs)
-builtins.print = _stderr_print
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 sys.path.insert(0, os.path.dirname(__file__))
 from match_game import match_screenshot
 
-data = json.loads(sys.stdin.read())
-cgp = data.get('cgp', '')
-players = data.get('players', [])
-scores = data.get('scores')
-if scores:
-    scores = tuple(scores)
-
-result = match_screenshot(cgp, players, scores)
-
-# Restore stdout print for the result
-builtins.print = _real_print
-print(json.dumps(result) if result else 'null')
+def main():
+    data = json.loads(sys.stdin.read())
+    cgp = data.get('cgp', '')
+    players = data.get('players', [])
+    scores = data.get('scores')
+    if scores:
+        scores = tuple(scores)
+
+    # Diagnostics from the matcher go to stderr so stdout stays pure JSON.
+    with redirect_stdout(sys.stderr):
+        result = match_screenshot(cgp, players, scores)
+
+    if result:
+        print(orjson.dumps(result).decode('utf-8') if orjson
+              else json.dumps(result))
+    else:
+        print('null')
+
+# match_screenshot spins up a ProcessPoolExecutor; under spawn/forkserver
+# start methods the workers re-import __main__, so the script body must
+# not run (and block on stdin) at import time.
+if __name__ == "__main__":
+    main()